@@ -1,11 +1,14 @@
 import os
-import json
+import orjson
 import streamlit as st
 import boto3
+import random
 import time
 from dotenv import load_dotenv
 from botocore.exceptions import ClientError
 
+from messages import Msg
+
 # Load environment variables
 load_dotenv()
 
@@ -21,7 +24,11 @@ aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
 aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
 aws_region = os.getenv("AWS_REGION", "eu-central-1")
 
-# Initialize Bedrock client with retry configuration
+# Cache decorator for shared resources (st.experimental_singleton on older Streamlit)
+cache_resource = getattr(st, "cache_resource", None) or st.experimental_singleton
+
+# Initialize Bedrock client with retry configuration, built once per process
+@cache_resource
 def get_bedrock_client():
     from botocore.config import Config
     
@@ -40,21 +47,12 @@ def get_bedrock_client():
         config=config
     )
 
-# Function to call Claude model via Bedrock with retry logic
-def call_claude_model(prompt, chat_history=[]):
+# Function to stream Claude model output via Bedrock with retry logic
+def call_claude_model_stream(messages):
     bedrock_client = get_bedrock_client()
     
-    # Format messages for Claude
-    messages = []
-    
-    # Add chat history to the messages
-    for msg in chat_history:
-        role = msg["role"]
-        content = msg["content"]
-        messages.append({"role": role, "content": content})
-    
-    # Add the current user message
-    messages.append({"role": "user", "content": prompt})
+    # History ends with the current user message; orjson serializes the Msg
+    # dataclasses natively as {"role", "content"} objects, so no dict copies are built
     
     # Prepare request payload for Claude
     request_body = {
@@ -65,29 +63,28 @@ def call_claude_model(prompt, chat_history=[]):
         "top_p": 0.9,
     }
     
-    # Retry logic for throttling
-    max_retries = 5
-    base_delay = 2  # Start with 2 seconds delay
+    # Last-resort retry for throttling; botocore's adaptive mode already retries inside each call
+    max_retries = 2
+    base_delay = 2  # Start with up to 2 seconds delay
+    max_delay = 30
     
     for attempt in range(max_retries):
         try:
-            # Invoke the Claude model
-            response = bedrock_client.invoke_model(
+            # Open the response stream for the Claude model
+            response = bedrock_client.invoke_model_with_response_stream(
                 modelId="anthropic.claude-3-sonnet-20240229-v1:0",
-                body=json.dumps(request_body)
+                body=orjson.dumps(request_body)
             )
-            
-            # Parse the response
-            response_body = json.loads(response.get('body').read())
-            return response_body.get('content')[0].get('text')
+            break
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
             
             if error_code == 'ThrottlingException':
                 if attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff
-                    st.warning(f"Rate limited. Retrying in {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
+                    # Capped exponential backoff with full jitter so sessions don't retry in lockstep
+                    delay = random.uniform(0, min(max_delay, base_delay * (1 << attempt)))
+                    st.warning(f"Rate limited. Retrying in {delay:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
                     time.sleep(delay)
                     continue
                 else:
@@ -97,6 +94,16 @@ def call_claude_model(prompt, chat_history=[]):
         
         except Exception as e:
             raise Exception(f"Unexpected error: {str(e)}")
+    
+    # Yield text deltas as they arrive
+    for event in response.get('body'):
+        chunk = event.get('chunk')
+        if not chunk:
+            continue
+        
+        chunk_body = orjson.loads(chunk.get('bytes'))
+        if chunk_body.get('type') == 'content_block_delta':
+            yield chunk_body.get('delta', {}).get('text', '')
 
 # Set up the Streamlit app
 def main():
@@ -109,40 +116,42 @@ def main():
     if "messages" not in st.session_state:
         st.session_state.messages = []
     
-    # Display chat history
+    # Display chat history. Streamlit clears anything not re-emitted on a rerun,
+    # so every message is redrawn; the frontend diffs unchanged elements, and
+    # st.markdown skips st.write's per-call type dispatch for plain strings
     for message in st.session_state.messages:
-        role = message["role"]
-        content = message["content"]
-        with st.chat_message(role):
-            st.write(content)
+        with st.chat_message(message.role):
+            st.markdown(message.content)
     
     # Input for new question
     if prompt := st.chat_input("Ask me anything..."):
         # Add user message to chat
-        user_message = {"role": "user", "content": prompt}
+        user_message = Msg(role="user", content=prompt)
         st.session_state.messages.append(user_message)
         
         # Display the user message
         with st.chat_message("user"):
-            st.write(prompt)
+            st.markdown(prompt)
         
-        # Show a spinner while waiting for the response
-        with st.spinner("Thinking..."):
-            try:
-                # Get Claude's response
-                response_text = call_claude_model(prompt, st.session_state.messages[:-1])
-                
-                # Add AI response to chat
-                assistant_message = {"role": "assistant", "content": response_text}
-                st.session_state.messages.append(assistant_message)
-                
-                # Display the assistant message
-                with st.chat_message("assistant"):
-                    st.write(response_text)
-                
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
-                st.session_state.messages.pop()  # Remove the user message if there was an error
+        try:
+            # Stream Claude's response into the assistant message
+            with st.chat_message("assistant"):
+                response_text = st.write_stream(
+                    call_claude_model_stream(st.session_state.messages)
+                )
+            
+            # st.write_stream returns a list, not a str, when nothing was streamed;
+            # storing it would give Bedrock an empty content field on every later turn
+            if not isinstance(response_text, str) or not response_text:
+                raise Exception("Claude returned an empty response. Please try again.")
+            
+            # Add AI response to chat
+            assistant_message = Msg(role="assistant", content=response_text)
+            st.session_state.messages.append(assistant_message)
+            
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+            st.session_state.messages.pop()  # Remove the user message if there was an error
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+# Chat message record stored in st.session_state.messages. It lives in its own
+# module because Streamlit re-executes app.py on every rerun: a class defined
+# there would be recreated each time, and messages from earlier runs would fail
+# isinstance checks against the new class.
+#
+# Compact layout (slots: no per-instance __dict__). __slots__ is declared by
+# hand because dataclass(slots=True) needs Python 3.10+. orjson serializes it
+# natively as a {"role", "content"} object.
+@dataclass
+class Msg:
+    __slots__ = ("role", "content")
+    role: str
+    content: str
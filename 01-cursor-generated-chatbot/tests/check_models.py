@@ -1,5 +1,6 @@
 import boto3
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv('../.env')
@@ -16,23 +17,16 @@ try:
     print("Fetching available models...")
     response = bedrock_client.list_foundation_models()
     
-    print(f"\nFound {len(response['modelSummaries'])} models:")
-    print("-" * 80)
+    # Only Claude models are of interest; filter first, then write once
+    claude_summaries = [m for m in response['modelSummaries'] if 'claude' in m['modelId'].lower()]
+    claude_models = [m['modelId'] for m in claude_summaries]
     
-    claude_models = []
-    for model in response['modelSummaries']:
-        model_id = model['modelId']
-        provider = model['providerName']
-        model_name = model['modelName']
-        
-        print(f"Model ID: {model_id}")
-        print(f"Provider: {provider}")
-        print(f"Name: {model_name}")
-        print("-" * 80)
-        
-        # Collect Claude models
-        if 'claude' in model_id.lower():
-            claude_models.append(model_id)
+    print(f"\nFound {len(response['modelSummaries'])} models, {len(claude_models)} Claude:")
+    print("-" * 80)
+    sys.stdout.write("".join(
+        f"{m['modelId']}\t{m['providerName']}\t{m['modelName']}\n" for m in claude_summaries
+    ))
+    print("-" * 80)
     
     print(f"\nClaude models found: {claude_models}")
     
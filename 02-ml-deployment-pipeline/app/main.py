@@ -1,14 +1,59 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
 import numpy as np
 
 from .model_loader import load_model
 
-app = FastAPI(title="ML Deploy Pipeline - Inference API")
+app = FastAPI(
+    title="ML Deploy Pipeline - Inference API",
+    default_response_class=ORJSONResponse,
+)
 
 # Load model at startup
 model, model_info = load_model()
 
+_warmed = False
+
+def warmup_model():
+    # One dummy prediction so the first real request skips lazy init and cold caches.
+    # Runs once at import (the Lambda init phase), not as a startup hook: Mangum
+    # replays the ASGI lifespan on every invocation
+    global _warmed
+    if _warmed:
+        return
+    try:
+        n_features = getattr(model, "n_features_in_", None) or len(model_info.get("feature_names", [0] * 4))
+        model.predict(np.zeros((1, n_features), dtype=np.float32))
+    except Exception as e:
+        print(f"⚠️  Model warmup failed: {e}")
+    _warmed = True
+
+warmup_model()
+
+# Class names as an array so batch lookups are a single fancy-index gather
+target_names = np.asarray(model_info["target_names"])
+
+# Micro-batching: concurrent /predict calls are grouped into one model.predict
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "32"))
+
+_batcher = {"loop": None, "queue": None, "task": None}
+
+# Dedicated pool for CPU-bound sklearn inference so it never runs on the event loop;
+# created lazily so it can be shut down with the app and recreated on the next startup
+EXECUTOR = None
+
+def get_executor():
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return EXECUTOR
+
 class PredictRequest(BaseModel):
     features: list[float]
 
@@ -16,6 +61,13 @@ class PredictResponse(BaseModel):
     prediction: int
     class_name: str
 
+class PredictBatchRequest(BaseModel):
+    features: list[list[float]]
+
+class PredictBatchResponse(BaseModel):
+    predictions: list[int]
+    class_names: list[str]
+
 @app.get("/")
 def root():
     return {
@@ -24,13 +76,116 @@ def root():
         "trained_on": model_info.get("created_utc"),
     }
 
-@app.post("/predict", response_model=PredictResponse)
-def predict(req: PredictRequest):
+def to_matrix(features):
+    # Build the typed, row-contiguous matrix in one C-level copy (no pandas
+    # or per-row conversion), then validate it against the trained model
+    try:
+        X = np.asarray(features, dtype=np.float32, order="C")
+    except ValueError:
+        raise HTTPException(status_code=422, detail="All rows must have the same number of features")
+
+    n_features = getattr(model, "n_features_in_", None)
+    if X.ndim != 2 or X.shape[0] == 0 or (n_features is not None and X.shape[1] != n_features):
+        raise HTTPException(status_code=422, detail=f"Expected a non-empty batch of rows with {n_features} features")
+    return X
+
+async def batcher(queue):
+    loop = asyncio.get_running_loop()
+    while True:
+        # Block for the first request, then take whatever is already queued and flush
+        # immediately; rows arriving while model.predict runs form the next batch
+        X, fut = await queue.get()
+        rows, futures = [X], [fut]
+        while len(rows) < MAX_BATCH_SIZE and not queue.empty():
+            X, fut = queue.get_nowait()
+            rows.append(X)
+            futures.append(fut)
+
+        # sklearn inference is synchronous, so keep it off the event loop
+        try:
+            preds = await loop.run_in_executor(get_executor(), model.predict, np.vstack(rows))
+        except Exception as e:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(e)
+            continue
+
+        for fut, pred in zip(futures, preds):
+            if not fut.done():
+                fut.set_result(pred)
+
+def get_batch_queue():
+    # (Re)start the batcher if it is not bound to the current event loop
+    loop = asyncio.get_running_loop()
+    if _batcher["loop"] is not loop or _batcher["task"] is None or _batcher["task"].done():
+        _batcher["loop"] = loop
+        _batcher["queue"] = asyncio.Queue()
+        _batcher["task"] = loop.create_task(batcher(_batcher["queue"]))
+    return _batcher["queue"]
+
+@app.on_event("startup")
+async def start_batcher():
+    get_batch_queue()
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    # Mangum runs a full lifespan per invocation; the next startup restarts both
+    global EXECUTOR
+    task, loop = _batcher["task"], _batcher["loop"]
+    if task is not None and not task.done():
+        task.cancel()
+        if loop is asyncio.get_running_loop():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _batcher.update(loop=None, queue=None, task=None)
+
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=False)
+        EXECUTOR = None
+
+async def parse_body(request: Request, model_cls):
+    # Validate the raw JSON bytes directly (pydantic-core fast path, no dict round-trip)
+    try:
+        return model_cls.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Same error shape FastAPI produces for declared body parameters
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
+def openapi_body(model_cls):
+    # Request schema for the docs, since the body is parsed manually
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model_cls.model_json_schema()}}}}
+
+@app.post(
+    "/predict",
+    responses={200: {"model": PredictResponse}},
+    openapi_extra=openapi_body(PredictRequest),
+)
+async def predict(request: Request):
     # Expect features as list[float], shape matches training data
-    X = np.array(req.features).reshape(1, -1)
-    pred = model.predict(X)[0]
-    class_name = model_info["target_names"][pred]
-    return {"prediction": int(pred), "class_name": class_name}
+    req = await parse_body(request, PredictRequest)
+    X = to_matrix([req.features])
+    fut = asyncio.get_running_loop().create_future()
+    await get_batch_queue().put((X, fut))
+    pred = await fut
+    # Returned directly: no response_model, so FastAPI skips outbound validation
+    return ORJSONResponse({"prediction": int(pred), "class_name": model_info["target_names"][pred]})
+
+@app.post(
+    "/predict_batch",
+    responses={200: {"model": PredictBatchResponse}},
+    openapi_extra=openapi_body(PredictBatchRequest),
+)
+async def predict_batch(request: Request):
+    # Expect features as list[list[float]], one row per sample
+    req = await parse_body(request, PredictBatchRequest)
+    X = to_matrix(req.features)
+    # CPU-bound sklearn call goes to the executor so it does not block the event loop
+    preds = await asyncio.get_running_loop().run_in_executor(get_executor(), model.predict, X)
+    return ORJSONResponse({"predictions": preds.tolist(), "class_names": target_names[preds].tolist()})
 
 from mangum import Mangum
 handler = Mangum(app)
@@ -1,18 +1,44 @@
-import os, glob, joblib, json
-from sklearn.ensemble import RandomForestClassifier
-import numpy as np
+import os, joblib, json
+from functools import lru_cache
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ARTIFACT_DIR = os.path.join(BASE_DIR, "artifacts")
 
+@lru_cache(maxsize=1)
 def get_latest_model_dir():
-    all_models = sorted(glob.glob(os.path.join(ARTIFACT_DIR, "model_*")), reverse=True)
+    # Single directory scan, memoized; call get_latest_model_dir.cache_clear() after retraining
+    try:
+        with os.scandir(ARTIFACT_DIR) as entries:
+            all_models = [e.path for e in entries if e.name.startswith("model_") and e.is_dir()]
+    except FileNotFoundError:
+        all_models = []
     if not all_models:
         raise FileNotFoundError("No model artifacts found. Run training first.")
-    return all_models[0]
+    # Timestamped names (model_YYYYmmddTHHMMSS) sort chronologically
+    return max(all_models)
+
+class OnnxModel:
+    """Thin wrapper exposing a sklearn-style predict() over an ONNX Runtime session"""
+
+    def __init__(self, path):
+        # Imported lazily: only needed when an ONNX artifact is actually served
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.n_features_in_ = model_input.shape[1]
+        self.label_name = self.session.get_outputs()[0].name
+
+    def predict(self, X):
+        return self.session.run([self.label_name], {self.input_name: X.astype("float32", copy=False)})[0]
 
 def create_mock_model():
     """Create a mock model for production when artifacts are not available"""
+    # Imported lazily: sklearn is heavy and only needed on this fallback path
+    from sklearn.ensemble import RandomForestClassifier
+    import numpy as np
+
     # Create a simple RandomForest model
     model = RandomForestClassifier(n_estimators=10, random_state=42)
     
@@ -49,7 +75,17 @@ def load_model():
     try:
         # Try to load from artifacts first
         latest = get_latest_model_dir()
-        model = joblib.load(os.path.join(latest, "model.joblib"))
+        onnx_path = os.path.join(latest, "model.onnx")
+        model = None
+        if os.path.exists(onnx_path):
+            # Prefer the ONNX export: fused C++ tree kernel instead of sklearn traversal
+            try:
+                model = OnnxModel(onnx_path)
+            except ImportError:
+                print("⚠️  onnxruntime not installed. Falling back to model.joblib.")
+        if model is None:
+            # Uncompressed dump, so loading skips decompression
+            model = joblib.load(os.path.join(latest, "model.joblib"))
 
         with open(os.path.join(latest, "model_info.json")) as f:
             info = json.load(f)
@@ -13,13 +13,35 @@ try:
 except:
     MLFLOW = False
 
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    SKL2ONNX = True
+except ImportError:
+    SKL2ONNX = False
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ART_DIR = os.path.join(BASE_DIR, "artifacts")
 ensure_dir(ART_DIR)
 
-def train(n_estimators=300, max_depth=None, experiment="baseline-iris"):
+def export_onnx(model, n_features, out):
+    # ONNX copy of the model for serving with ONNX Runtime (skipped without skl2onnx)
+    if not SKL2ONNX:
+        return
+    onx = convert_sklearn(
+        model,
+        initial_types=[("input", FloatTensorType([None, n_features]))],
+        options={id(model): {"zipmap": False}},
+    )
+    with open(os.path.join(out, "model.onnx"), "wb") as f:
+        f.write(onx.SerializeToString())
+
+def train(n_estimators=100, max_depth=6, ccp_alpha=1e-3, experiment="baseline-iris"):
     (X_train, y_train), (X_test, y_test), feature_names, target_names = load_iris()
-    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, n_jobs=-1, random_state=42)
+    # Fewer, shallower, cost-complexity-pruned trees: smaller artifact and faster traversal
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth, ccp_alpha=ccp_alpha, n_jobs=-1, random_state=42
+    )
 
     if MLFLOW:
         mlflow.set_tracking_uri(f"file://{os.path.join(BASE_DIR, 'mlruns')}")
@@ -32,19 +54,23 @@ def train(n_estimators=300, max_depth=None, experiment="baseline-iris"):
 
             mlflow.log_param("n_estimators", n_estimators)
             mlflow.log_param("max_depth", max_depth)
+            mlflow.log_param("ccp_alpha", ccp_alpha)
             mlflow.log_metric("accuracy", acc)
             mlflow.log_metric("f1_macro", f1)
 
             stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
             out = os.path.join(ART_DIR, f"model_{stamp}")
             ensure_dir(out)
-            joblib.dump(model, os.path.join(out, "model.joblib"))
+            joblib.dump(model, os.path.join(out, "model.joblib"), compress=0, protocol=5)  # uncompressed so loading skips decompression
+            export_onnx(model, X_train.shape[1], out)
 
             save_metrics(out, {"accuracy": acc, "f1_macro": f1})
             save_info(out, {
                 "model_type": "RandomForestClassifier",
-                "n_estimators": n_estimators,
+                "n_estimators": len(model.estimators_),
                 "max_depth": max_depth,
+                "ccp_alpha": ccp_alpha,
+                "tree_node_counts": [est.tree_.node_count for est in model.estimators_],
                 "feature_names": feature_names,
                 "target_names": target_names.tolist(),
                 "created_utc": datetime.utcnow().isoformat() + "Z",
@@ -66,12 +92,15 @@ def train(n_estimators=300, max_depth=None, experiment="baseline-iris"):
         stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
         out = os.path.join(ART_DIR, f"model_{stamp}")
         ensure_dir(out)
-        joblib.dump(model, os.path.join(out, "model.joblib"))
+        joblib.dump(model, os.path.join(out, "model.joblib"), compress=0, protocol=5)  # uncompressed so loading skips decompression
+        export_onnx(model, X_train.shape[1], out)
         save_metrics(out, {"accuracy": acc, "f1_macro": f1})
         save_info(out, {
             "model_type": "RandomForestClassifier",
-            "n_estimators": n_estimators,
+            "n_estimators": len(model.estimators_),
             "max_depth": max_depth,
+            "ccp_alpha": ccp_alpha,
+            "tree_node_counts": [est.tree_.node_count for est in model.estimators_],
             "feature_names": feature_names,
             "target_names": target_names.tolist(),
             "created_utc": datetime.utcnow().isoformat() + "Z",
@@ -48,6 +48,152 @@ def test_predict_endpoint_missing_features():
     response = client.post("/predict", json=test_data)
     assert response.status_code == 422  # Validation error
 
+def test_predict_batch_endpoint():
+    """Test the batch predict endpoint with multiple rows"""
+    test_data = {
+        "features": [
+            [5.1, 3.5, 1.4, 0.2],
+            [6.7, 3.0, 5.2, 2.3],
+            [5.9, 3.0, 4.2, 1.5],
+        ]
+    }
+    
+    response = client.post("/predict_batch", json=test_data)
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert len(data["predictions"]) == 3
+    assert len(data["class_names"]) == 3
+    assert all(isinstance(p, int) for p in data["predictions"])
+    assert all(isinstance(c, str) for c in data["class_names"])
+    
+    # Batch results must match single-row predictions
+    single = client.post("/predict", json={"features": test_data["features"][0]}).json()
+    assert data["predictions"][0] == single["prediction"]
+    assert data["class_names"][0] == single["class_name"]
+
+def test_predict_batch_endpoint_invalid_input():
+    """Test the batch predict endpoint with ragged or empty input"""
+    response = client.post("/predict_batch", json={"features": [[5.1, 3.5, 1.4, 0.2], [5.1, 3.5]]})
+    assert response.status_code == 422
+    
+    response = client.post("/predict_batch", json={"features": []})
+    assert response.status_code == 422
+
+def test_predict_endpoint_concurrent_requests():
+    """Test that concurrent predict calls are micro-batched and answered correctly"""
+    import asyncio
+    import httpx
+    from app import main
+    
+    rows = [[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3], [5.9, 3.0, 4.2, 1.5]] * 4
+    expected = client.post("/predict_batch", json={"features": rows}).json()
+    
+    batch_sizes = []
+    original_predict = main.model.predict
+    
+    def recording_predict(X):
+        batch_sizes.append(len(X))
+        return original_predict(X)
+    
+    async def send_all():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+            return await asyncio.gather(
+                *(async_client.post("/predict", json={"features": row}) for row in rows)
+            )
+    
+    main.model.predict = recording_predict
+    try:
+        responses = asyncio.run(send_all())
+    finally:
+        main.model.predict = original_predict
+    
+    assert all(r.status_code == 200 for r in responses)
+    assert [r.json()["prediction"] for r in responses] == expected["predictions"]
+    assert [r.json()["class_name"] for r in responses] == expected["class_names"]
+    assert sum(batch_sizes) == len(rows)
+    assert len(batch_sizes) < len(rows)
+
+def test_predict_single_request_not_delayed():
+    """Test that a lone request is flushed to the model without waiting for a batch"""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    import numpy as np
+    from app import main
+    
+    submitted = []
+    
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(len(args[0]))
+            return super().submit(fn, *args, **kwargs)
+    
+    async def send_one():
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        await main.get_batch_queue().put((np.array([[5.1, 3.5, 1.4, 0.2]], dtype=np.float32), fut))
+        # A few loop iterations, no timers: the batch must already be submitted
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert submitted == [1]
+        return await fut
+    
+    original_executor = main.EXECUTOR
+    main.EXECUTOR = RecordingExecutor(max_workers=1)
+    try:
+        pred = asyncio.run(send_one())
+    finally:
+        main.EXECUTOR.shutdown()
+        main.EXECUTOR = original_executor
+    
+    assert int(pred) == 0
+
+def test_lifespan_shutdown_stops_batcher():
+    """Test that shutdown cancels the batcher and executor, and the next lifespan restarts them"""
+    from app import main
+    
+    # Mangum runs one full lifespan per Lambda invocation
+    for _ in range(2):
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post("/predict", json={"features": [5.1, 3.5, 1.4, 0.2]})
+            assert response.status_code == 200
+            task = main._batcher["task"]
+            assert task is not None and not task.done()
+        
+        assert task.cancelled()
+        assert main._batcher["task"] is None
+        assert main.EXECUTOR is None
+
+def test_warmup_runs_once():
+    """Test that repeated startup events (one per Mangum invocation) do not re-run the warmup"""
+    import asyncio
+    from app import main
+    
+    calls = []
+    original_predict = main.model.predict
+    
+    def recording_predict(X):
+        calls.append(len(X))
+        return original_predict(X)
+    
+    async def run_startup():
+        for handler in app.router.on_startup:
+            result = handler()
+            if asyncio.iscoroutine(result):
+                await result
+    
+    main.model.predict = recording_predict
+    main._warmed = False
+    try:
+        main.warmup_model()
+        for _ in range(2):
+            asyncio.run(run_startup())
+        main.warmup_model()
+    finally:
+        main.model.predict = original_predict
+    
+    assert calls == [1]
+
 def test_model_loading():
     """Test that model can be loaded successfully"""
     from app.model_loader import load_model
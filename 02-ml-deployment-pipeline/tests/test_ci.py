@@ -16,6 +16,25 @@ def test_model_loader_handles_missing_artifacts():
     with pytest.raises(FileNotFoundError, match="No model artifacts found"):
         get_latest_model_dir()
 
+def test_onnx_model_matches_sklearn(tmp_path):
+    """Test that the ONNX export predicts the same classes as the sklearn model"""
+    pytest.importorskip("skl2onnx")
+    pytest.importorskip("onnxruntime")
+    import numpy as np
+    from sklearn.datasets import load_iris
+    from sklearn.ensemble import RandomForestClassifier
+    from src.train import export_onnx
+    from app.model_loader import OnnxModel
+    
+    X, y = load_iris(return_X_y=True)
+    model = RandomForestClassifier(n_estimators=10, random_state=42).fit(X, y)
+    export_onnx(model, X.shape[1], str(tmp_path))
+    
+    onnx_model = OnnxModel(str(tmp_path / "model.onnx"))
+    X32 = X.astype(np.float32)
+    assert onnx_model.n_features_in_ == 4
+    assert (onnx_model.predict(X32) == model.predict(X32)).all()
+
 def test_fastapi_components():
     """Test that FastAPI components can be imported"""
     from fastapi import FastAPI